@@ -1,24 +1,18 @@
 #!/usr/bin/env python3
-from datetime import datetime, timezone
-from typing import Optional
+# annotations are never evaluated, so the window type hints below don't need typing imported at runtime
+from __future__ import annotations
 
 # notes on ncurses:
 #   - clear() will reset a window position, not just clear contents.  https://lists.gnu.org/archive/html/bug-ncurses/2014-01/msg00007.html
 #   - erase clears the contents of an existing window, which is considerably faster
 #   - clrtoeol() can clear to end of line, clrtobot() will clear the bottom of the screen
-#   - writing outside of a subwindow bounds will throw an err -- see try/except guards
+#   - writing outside of a window's bounds will throw an err, and writing its bottom right cell scrolls a scrollok
+#     window -- painted lines are clipped to max_x - 1
 # other notes:
-# - we probably could have done without the input window complexity, instead just redrawing the prompt on current main line
+# - there is no input or result subwindow, the prompt's line of main is redrawn instead. when the prompt is on the
+#   last line, main grabs another line (scrolls) for the result
 # known bugs:
-# - we should stop moving the input window before we hit the max screen size via main and stop painting in position y+1,
-#   which may fix other resizing errors.  scrolling back into the buffer works fine; refactor so main grabs another
-#   line, then handles result_window_move
 # - when window max is hit, prior input is not preserved
-# - resizing from max screen size:
-#       - resizing from cursor 0 to size 3 will "crash" (caught) with no input
-#       - resizing from cursor 0 to cursor 1 with input will "crash" (caught)
-#   this is likely related to the result expanding beyond getmaxyx() bounds. a possible solution would be adding
-#   another window that simply acts as a buffer at the bottom of the screen.
 RESIZE_ORD = 410 # fires in my iterm2 + tmux when resizing a window
 
 EOF_CHORD = 4 # ^d
@@ -27,6 +21,12 @@ KEY_Q = ord("q") # a 'q' in any position at any time will exit
 KEY_BACKSPACE = 127 # ord('\x7f')
 KEY_DELETE = 330
 
+# color pair numbers: the result line's error colors and the input line's debug background
+PAIR_ERROR = 1
+PAIR_DEBUG = 2
+
+INVALID_HEX_MESSAGE = "invalid input for base 16 conversion"
+
 def hex_to_dec(input_value):
     """Convert input_value from hex to decimal. Accepts string returns string.
 
@@ -48,437 +48,644 @@ def hex_to_dec(input_value):
     try:
         ret = int(input_value, 16)
     except ValueError:
-        return "invalid input for base 16 conversion"
+        return INVALID_HEX_MESSAGE
     return ret
 
 def hex_to_dec_str(input_value):
-    return str(hex_to_dec(input_value))
-
-# type annotation because try/except value check
-# instead of pythonic guardrail crash
+    # converts and formats in one place instead of str() over hex_to_dec's int-or-message return.
+    # only the parse is guarded: str() also raises ValueError past the 3.11+ digit limit, which isn't bad input
+    try:
+        value = int(input_value, 16)
+    except ValueError:
+        return INVALID_HEX_MESSAGE
+    return _int_to_str_fast(value)
+
+# inputs at least this long are parsed with bytes.fromhex. its C loop over byte pairs beats int(s, 16) once the
+# string is long (~1.6x at a few thousand digits), below this the extra bytes object costs more than it saves
+FROMHEX_MIN_LEN = 512
+
+# the non-interactive path converts exactly once, so the ValueError is handled at that call site
+# instead of inside the conversion.  fromhex also skips spaces between byte pairs, which int() would reject,
+# so only plain ascii letters/digits take the fast path and anything fromhex refuses is left to int()
+def _hex_to_int_fast(s):
+    if len(s) >= FROMHEX_MIN_LEN and s.isascii() and s.isalnum():
+        try:
+            return int.from_bytes(bytes.fromhex(s if len(s) % 2 == 0 else "0" + s), "big")
+        except ValueError:
+            pass
+    return int(s, 16)
+
+# ints up to this many bits are handed straight to str(). ~1233 decimal digits, well under the 4300 digit
+# limit python 3.11+ places on str(int)
+_STR_LEAF_BITS = 4096
+
+# _int_to_str_fast formats an int of any size in decimal.  str() on a big int is quadratic, and on python
+# 3.11+ raises ValueError past sys.get_int_max_str_digits(), which happens for ~3600+ hex digits of CLI input.
+# the value is split in halves with divmod by 10^(18 * 2^k), each low half zero padded to its width, until the
+# pieces are small enough for str()
+def _int_to_str_fast(n):
+    if n.bit_length() <= _STR_LEAF_BITS:
+        return str(n)
+
+    # powers[k] == 10^(18 * 2^k), until powers[-1]^2 would exceed n
+    powers = [10 ** 18]
+    while True:
+        square = powers[-1] * powers[-1]
+        if square > n:
+            break
+        powers.append(square)
+
+    # x < powers[k + 1].  pad is the digit count x must be zero filled to, 0 for the leading (unpadded) part
+    def digits(x, k, pad):
+        if k < 0 or x.bit_length() <= _STR_LEAF_BITS:
+            return str(x).zfill(pad)
+        hi, lo = divmod(x, powers[k])
+        width = 18 << k
+        if not pad and not hi:
+            return digits(lo, k - 1, 0)
+        return digits(hi, k - 1, max(pad - width, 0)) + digits(lo, k - 1, width)
+
+    return digits(n, len(powers) - 1, 0)
+
+# GMPY2_MIN_LEN is the CLI input length past which gmpy2 is tried for the decimal formatting
+GMPY2_MIN_LEN = 64
+
+# _load_gmpy2_digits returns a gmpy2 based int to decimal string conversion, or None if gmpy2 is not installed.
+# for long CLI input GMP converts in subquadratic time. imported lazily so the short CLI path never pays for it
+def _load_gmpy2_digits():
+    try:
+        import gmpy2
+    except ImportError:
+        return None
+    mpz = gmpy2.mpz
+    return lambda n: mpz(n).digits(10)
+
+# 256 entry table indexed by ordinal. 1 for [0-9a-fA-F], 0 for everything else.
+# the tables are built from slices of the three digit ranges instead of a loop over all 256 ordinals,
+# they are built on every run, CLI conversions included
+_HEX_LUT = bytearray(256)
+_HEX_LUT[48:58] = b"\x01" * 10
+_HEX_LUT[65:71] = _HEX_LUT[97:103] = b"\x01" * 6
+_HEX_LUT = bytes(_HEX_LUT)
+# 256 entry table indexed by ordinal, holding the nibble value (0-15) of a hex char. 0 for non-hex.
+# upper and lower case both have entries, so the raw getch() ordinal is looked up without any case folding
+_HEX_VAL = bytearray(256)
+_HEX_VAL[48:58], _HEX_VAL[65:71], _HEX_VAL[97:103] = range(10), range(10, 16), range(10, 16)
+_HEX_VAL = bytes(_HEX_VAL)
+
+# whitelist check against _HEX_LUT before raising and catching ValueError from int()
+# single chars (the per-keystroke case) are one ord() and one table lookup, longer strings check each ascii byte
 def is_hex(s: str) -> bool:
+    if len(s) == 1:
+        o = ord(s)
+        return o < 256 and _HEX_LUT[o] == 1
+    if s and s.isascii() and all(_HEX_LUT[c] for c in s.encode("ascii")):
+        return True
+    # anything else int() still takes (0x prefix, surrounding whitespace, underscores) goes the slow way
     try:
         int(s, 16)
-        return True
     except ValueError:
         return False
+    return True
+
+# stands in for Htoi.log when debug is off
+def _noop(*args, **kwargs):
+    pass
 
 # Htoi is a ncurses application for converting from hex to decimal
-# note that an intentional chain of `if` statements are used instead of
+# note that keys are dispatched through a dict of handlers instead of
 # python 3.10's switch/match for purposes of wider availability.
 class Htoi:
 
     def __init__(self, debug=False):
         self.debug=debug
+        # with debug off, log is a no-op so call sites don't need a `self.debug and` guard
+        # python -O compiles debug logging out entirely
+        self.log = self._log_real if debug and __debug__ else _noop
         self.prompt = ""
+        # the prompts are ascii and only ever written whole, so they are also kept encoded. curses writes
+        # bytes as they are instead of converting a str to wide chars on every addstr
+        self.prompt_bytes = b""
+        # cached len(self.prompt), the column the input starts at
+        self._prompt_len = 0
+        self._input_room = 0
         self.prompt_suffix = "htoi > "
 
+        # line of main_window the prompt and input are on.  tracked here rather than read back with getyx(),
+        # as the cursor is moved around by painting the result line
         self.main_cursor_y = 0
-        self.main_cursor_x = 0
         self.main_window: Optional["curses._CursesWindow"] = None  # window bound in main
 
-        self.input_cursor_y = 0
-        self.input_cursor_x = 0
-        # type annotation used for IDE hints
-        self.input_window: Optional["curses._CursesWindow"] = None  # window bound in main
-
-        self.result_cursor_y = 0
-        self.result_cursor_x = 0
-
-        # tracks line for desired window position, not the cursor
-        self.result_window_pos_y = 0
-        # type annotation used for IDE hints
-        self.result_window: Optional["curses._CursesWindow"] = None  # window bound in main
+        # line of main_window the live result (or an error) is painted on, the line under the prompt
+        self.result_line_y = 0
 
         self.welcome_prompt = "Please insert your hexadecimal value. \\n to convert, ^C or q to exit\n"
+        self.welcome_prompt_bytes = self.welcome_prompt.encode("ascii")
 
         self.last_input = ""
-        self.current_input = ""
+        # ascii bytes of the hex typed so far, see the current_input property
+        self._cur_buf = bytearray()
+        # integer value of current_input, updated a nibble at a time as chars are added/removed
+        # so that a keystroke does not re-parse all of current_input. the interactive path formats it
+        # directly with an f-string; hex_to_dec/hex_to_dec_str stay for the CLI and library callers
+        self._cur_val = 0
+        # what was last written on the input and result lines. a keystroke that would
+        # paint the same string again skips the clear/addstr entirely.
+        # _last_painted_input is None after typed chars are appended, as it isn't rebuilt per keystroke
+        self._last_painted_input = ""
+        self._last_painted_result = ""
+        # the result line has the error colors. set when an error is painted and dropped by the next paint,
+        # so a result only has to be written from the first column right after an error
+        self._result_line_is_error = False
 
         # storing error in the function scope allows
-        # for cheaply checking error status instead of dealing with a window object
+        # for cheaply checking error status instead of reading it back off the screen
         self.error = ""
         # once we hit the window max Y limit, we're no longer able to calculate this based on cursor position
         self.input_line_index = 0
-
-    # subwindow moving is not supported, even though mvwin will not complain
-    # ("remove  970913 feature for copying subwindow" https://ncurses.scripts.mit.edu/?p=ncurses.git;a=blobdiff;f=ANNOUNCE;h=11933c5f6d55f4f21e79e0829da3c801365977ce;hp=bbeeb8922d4724c0b184b8de901cfb0d99577bb5;hb=bfe753d2dbaed1587556f1dc89bb14066d075c8c;hpb=027ae42953e3186daed8f3882da73de48291b606)
-    # if the main window has changed and will cause a violation/err on painting, we need to nuke and rebind
-    # e.g. initial prompt of:
-    #   prompt: "9 htoi > "
-    #   idx:     012345678
-    # a subwindow bound at 0 will place the cursor at idx 9
-    # when prompt becomes:
-    #   prompt: "10 htoi > "
-    #   idx:     0123456789
-    # then our subwindow will collide when trying to paint and an error will be thrown
+        # main_window dimensions, read at startup and on resize
+        self._main_max_y = 0
+        self._main_max_x = 0
+        # color pair attributes, bound in main after init_pair
+        self._err_attr = 0
+        self._dbg_attr = 0
+        # attribute typed chars are drawn with, the debug background or none
+        self._input_attr = 0
+
+    # _set_prompt builds the line-numbered prompt and caches its length alongside it, along with the
+    # columns that leaves for the input (see _set_input_room)
+    def _set_prompt(self, line_index):
+        self.prompt = f"{line_index} {self.prompt_suffix}"
+        self.prompt_bytes = self.prompt.encode("ascii")
+        self._prompt_len = len(self.prompt)
+        self._set_input_room()
+
+    # _input_room is how many input chars fit after the prompt without touching the last column.  it only
+    # changes with the prompt or the width, so it is kept up to date there instead of worked out per keystroke
+    def _set_input_room(self):
+        self._input_room = self._main_max_x - self._prompt_len - 1
+
+    # current_input is kept as a bytearray so a typed char or a backspace is an in-place append/delete
+    # instead of building a new str. the str is only materialized when painting, recalling or confirming
+    @property
+    def current_input(self):
+        return self._cur_buf.decode("ascii")
+
+    @current_input.setter
+    def current_input(self, value):
+        self._cur_buf = bytearray(value, "ascii")
+
+    # everything is painted straight into main_window: the input on the prompt's line after the prompt,
+    # the live result on the line under it.  there are no subwindows to create, move, rebind when the
+    # prompt grows a digit, or keep inside the screen on resize
     #
-    #  manage_input_subwin tracks when our prompt length changes and manages destroying and recreating our subwin
-    def manage_input_subwin(self, line_count):
-        if line_count < 0:
-            # we should not be here
-            return
+    #   [ main: 3 htoi > ][ input ]
+    #   [ main: live result / error ]
 
-        # if power of 10, we shouldn't have any decimal
-        if log10(line_count).is_integer():
-            # explicitly delete our subwindow before assignment
-            # a code-dive should take place to see if re-assignment does a clean GC
-            del self.input_window
-            self.new_input_win()
-            self.debug and self.input_window.bkgd(' ', curses.color_pair(2))
-            self.input_window.clear()
-            self.debug and self.log("creating new subwindow of length: {}".format(len(self.prompt)))
-
-    # create a subwindow for user input
-    # this allows us to write user input and overwrite it with keypresses
-    def new_input_win(self):
-        main_y, _ = self.main_window.getyx()
-        # we subwindow on main_y and prompt chars offset.  we track these values to
-        # move the input_window dynamically along with our prompt
-        self.input_window = self.main_window.subwin(1, 0, main_y , len(self.prompt))
-        self.input_window.scrollok(True) # don't crash when exceeding max (e.g. X axis on small width)
-        self.input_window.keypad(True) # keypad(True) to differentiate between up arrow and 'A'
-        self.input_window.refresh()
-
-    # input_window_move moves a cursor for the input window relative to main window cursor subwindow
-    # self.input_window.getparyx() (get parent yx) should report where parent cursor is, but it's tracking self.input_window
-    # it's possible that there's a window sync command that simplifies this whole process of tracking the main position with
-    def input_window_move(self, y, x=0):
-        # we want to track our input_window alongside the prompt window
-        # self.input_cursor_x = self.main_cursor_x # floats to the end of the prompt
-        try:
-            self.debug and self.log("{} [y,x] [{}, {}]".format("moving input window position to:", y, x))
-            self.input_window.mvwin(y, x)  # this line breaks going from 0 back up
-        except:
-            self.debug and self.log("[EXCEPTION] failed to move input window to [y,x] [{}, {}]".format(y, x))
-
-    def input_window_replace(self, contents):
-        self.debug and self.log("replacing input window with contents: {}".format(contents))
-        self.input_window_wipe()
-        self.input_window.addstr(contents)
-
-    # wipe clears an input window
-    def input_window_wipe(self):
-        if not self.input_window:
-            self.debug and self.log("attempted to clear null input_window")
+    # input_line_replace paints contents after the prompt.  it is clipped to the columns left on the prompt's
+    # line, keeping the end (where the cursor is) visible, so a long input can't wrap onto the result line
+    def input_line_replace(self, contents):
+        if contents == self._last_painted_input:
             return
-        self.input_window.erase()
-        self.debug and self.log("cleared input window and moved to coordinates [y,x]: [{}, {}]".format(self.result_cursor_y, 0))
-
-    # create a subwindow for error feedback and results
-    def new_result_win(self):
-        # single height, no columns.  transparent with no input. after we get the cursor position, we can move this.
-        # if ever the result is moved to the bottom of the screen, remember to leave a row+1 for newline, a column+1 for the cursor
-        self.result_window = self.main_window.subwin(1, 0, 0, 0) # moved when painting results.  initialized at 0,0
-        self.result_window.keypad(True) # keypad(True) to differentiate between up arrow and 'A'
-        self.result_window.leaveok(True) # leaveok prevents the cursor from jumping to window after write. see also: curses.filter() before initscr()
-        self.result_window.scrollok(True)
-
-    # result window positioning
-    #
-    # if we won't overflow the window, set the result window position to the "next line"
-    # if we have a height of 1, allow result line to output over prompt
-    #
-    def result_window_move(self):
+        self.log("replacing input line with contents: {}", contents)
+        main_window = self.main_window
+        room = self._input_room
+        # overwrite in place and clear whatever is left of the old contents
+        main_window.move(self.main_cursor_y, self._prompt_len)
+        if room > 0 and len(contents) > 0:
+            main_window.addstr(contents[-room:])
+        main_window.clrtoeol()
+        self.debug and main_window.chgat(self.main_cursor_y, self._prompt_len, -1, self._dbg_attr)
+        self._last_painted_input = contents
+
+    # input_line_append paints typed chars after what is already on the input line, or repaints the
+    # (clipped) line when they don't fit on it.  chars are the ascii bytes just added to _cur_buf
+    def input_line_append(self, chars):
+        if len(self._cur_buf) <= self._input_room:
+            x = self._prompt_len + len(self._cur_buf) - len(chars)
+            self.main_window.addstr(self.main_cursor_y, x, chars, self._input_attr)
+            self._last_painted_input = None
+        else:
+            self.input_line_replace(self.current_input)
+
+    # input_line_backspace drops the last char off the screen after it was deleted from _cur_buf. while the
+    # input fits on the line that is clearing the one cell, instead of decoding and repainting the whole input
+    def input_line_backspace(self):
+        if len(self._cur_buf) < self._input_room:
+            x = self._prompt_len + len(self._cur_buf)
+            self.main_window.move(self.main_cursor_y, x)
+            self.main_window.clrtoeol()
+            self.debug and self.main_window.chgat(self.main_cursor_y, x, -1, self._dbg_attr)
+            self._last_painted_input = None
+        else:
+            self.input_line_replace(self.current_input)
 
-        main_max_y, _ = self.main_window.getmaxyx()
+    # input_line_cursor_x is where the cursor sits: the end of the input, or the last column when it is clipped
+    def input_line_cursor_x(self):
+        return self._prompt_len + min(len(self._cur_buf), self._input_room)
 
-        if self.main_cursor_y + 1 < main_max_y:
-            self.result_window_pos_y = self.main_cursor_y + 1
-            # if max is y=2 and cursor will move to y=1, this crashes without being guarded
-            # if self.max_y == 2:
-            #     new_y = 1
-            # current line + 1, start of line
-            self.debug and self.log("{} [y,x] [{}, {}]".format("moving result window to:", self.result_window_pos_y, 0))
-            try:
-                self.result_window.mvwin(self.result_window_pos_y, 0)  # this line crashes when scaling up from y height=0
-            except:
-                self.debug and self.log("[EXCEPTION] failed to move result window to [y,x] [{}, {}]".format(self.result_window_pos_y, len(self.prompt)))
+    # result line positioning
+    #
+    # the result goes on the line under the prompt.  when the prompt is on main_window's last line there is no
+    # such line, so main grabs one by scrolling up a line, instead of the result painting over the prompt
+    #
+    def result_line_move(self):
+        if self.main_cursor_y + 1 >= self._main_max_y and self.main_cursor_y > 0:
+            self.main_window.scroll(1)
+            self.main_cursor_y -= 1
+            self._last_painted_result = ""
+            self._result_line_is_error = False
+            self.log("[max size constraint] scrolled main window up for the result line")
+        self.result_line_y = self.main_cursor_y + 1
+
+    # result_line_repaint redraws the error or live result from scratch, for when the line under the prompt
+    # may have been lost or the width changed (resize)
+    def result_line_repaint(self):
+        if len(self.error) == 0 and len(self._cur_buf) == 0:
+            return
+        self.result_line_move()
+        if self.result_line_y >= self._main_max_y:
+            return
+        self._last_painted_result = ""
+        if len(self.error) > 0:
+            self.result_line_paint_error()
         else:
-            self.result_window_pos_y = main_max_y - 1
-            # this condition will be hit if the result window is moved before
-            if self.result_window_pos_y < 0:
-                self.result_window_pos_y = 0
+            self.result_line_replace(f"{self._cur_val}")
 
-            self.debug and self.log("{} [y,x] [{}, {}]".format("[max size constraint] moving result window to: ", self.result_window_pos_y , 0))
-            # there will be no room for the confirmed result, but max_y -1 will keep the result within the bounds as we scale down
-            try:
-                self.result_window.mvwin(self.result_window_pos_y, 0)
-            except:
-                self.debug and self.log("[EXCEPTION] failed to move result window to [y,x] [{}, {}]".format(self.result_window_pos_y, len(self.prompt)))
-
-
-    # result_window_set_invalid_input_error clears any existing error, writes a new error, and preserves the
-    # window's location from the last char input
-    def result_window_set_invalid_input_error(self, i, i_chr):
-        self.result_window_wipe()
-        self.result_window.bkgd(' ', curses.color_pair(1))
-        # the result_window has been moved for us into position already by result_window_clear(
-        self.error = "input not valid hexadecimal character. ord: {o} chr: {c}".format(o=i, c=i_chr)
-        self.result_window.addstr(self.error)
-        self.result_window.refresh()
-
-    # result_window_wipe clears any existing result and preserves the window's last location
-    # from the last char input
-    def result_window_wipe(self):
-        if not self.result_window:
-            self.debug and self.log("attempted to clear null result_window")
+    # result_line_set_invalid_input_error writes a new error over any existing result or error
+    def result_line_set_invalid_input_error(self, i, i_chr):
+        self.error = f"input not valid hexadecimal character. ord: {i} chr: {i_chr}"
+        # the same invalid char twice in a row is already on screen
+        if self.error == self._last_painted_result:
             return
-        self.result_window.leaveok(True)  # don't move the cursor to the result window
-        # if we previously had an error, the result window will have a background used for errors
-        self.result_window.bkgd(' ')
-        self.result_window.erase()
-        self.debug and self.log("cleared result window".format(self.result_window_pos_y, 0))
-        self.result_window.refresh()
-
-    @staticmethod
-    def log(message):
-        with open("debug.log", "a") as f:
-            time_marker = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-            f.write("[{timeMarker}] {msg}\n".format(timeMarker=time_marker, msg=message))
+        self.result_line_paint_error()
 
+    # result_line_paint_error paints self.error on the result line, clipped to it, and gives the whole line
+    # the error colors
+    def result_line_paint_error(self):
+        y = self.result_line_y
+        if y >= self._main_max_y:
+            return
+        main_window = self.main_window
+        main_window.addnstr(y, 0, self.error, self._main_max_x - 1)
+        main_window.clrtoeol()
+        main_window.chgat(y, 0, -1, self._err_attr)
+        self._last_painted_result = self.error
+        self._result_line_is_error = True
+
+    # result_line_wipe clears any existing result or error.  clrtoeol blanks with main_window's own background,
+    # which also drops the error colors
+    def result_line_wipe(self):
+        if self._last_painted_result == "" or self.result_line_y >= self._main_max_y:
+            return
+        self.main_window.move(self.result_line_y, 0)
+        self.main_window.clrtoeol()
+        self._last_painted_result = ""
+        self._result_line_is_error = False
+        self.log("cleared result line")
+
+    # result_line_replace overwrites the result in place (move, addstr, clrtoeol), never wiping it first.
+    # addstr and clrtoeol paint with main_window's own background, so writing over an error from its first
+    # column also drops the error colors
+    def result_line_replace(self, contents):
+        if self.result_line_y >= self._main_max_y:
+            return
+        last = "" if self._result_line_is_error else self._last_painted_result
+        # the leading digits the old and new results share are left in place and only the rest is written.
+        # typing a digit usually changes just the tail of the result. both are clipped to the line
+        width = self._main_max_x - 1
+        shown = contents[:width]
+        same = len(os.path.commonprefix((last[:width], shown)))
+        self.main_window.move(self.result_line_y, same)
+        # if we send an empty string to addstr, we'll get back an error
+        if len(shown) > same:
+            self.main_window.addstr(shown[same:])
+        self.main_window.clrtoeol()
+        self._last_painted_result = contents
+        self._result_line_is_error = False
+
+    # datetime and time are only imported along with opening the log, interactive mode without --debug never needs them
+    _datetime = None
+    _utc = None
+    _time = None
+    # the timestamp is formatted once per unix second and reused for every line logged within it
+    _stamp_sec = -1
+    _stamp = ""
+    # debug.log is opened on the first log line and held, line buffered so a crash still leaves every line written
+    _log_fh = None
+
+    @classmethod
+    # message is only formatted with args here, after the debug check, so call sites pass
+    # values instead of pre-formatting a string the no-op log would throw away
+    def _log_real(cls, message, *args, **kwargs):
+        if args or kwargs:
+            message = message.format(*args, **kwargs)
+        if cls._log_fh is None:
+            import atexit
+            from datetime import datetime, timezone
+            from time import time
+            cls._datetime, cls._utc, cls._time = datetime, timezone.utc, time
+            cls._log_fh = open("debug.log", "a", buffering=1, encoding="utf-8")
+            atexit.register(cls._log_fh.close)
+        sec = int(cls._time())
+        if sec != cls._stamp_sec:
+            cls._stamp = cls._datetime.fromtimestamp(sec, cls._utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            cls._stamp_sec = sec
+        cls._log_fh.write(f"[{cls._stamp}] {message}\n")
+
+    # the cursor read below is a C call made only to be logged, so without debug there is nothing to do
     def report_positions(self):
-        main_max_y, main_max_x = self.main_window.getmaxyx()
-        ic_my, ic_mx = self.input_window.getmaxyx()
-        # max y for result_window is a function of main_max_y
-        _, rw_mx = self.result_window.getmaxyx()
+        if not self.debug:
+            return
+        cursor_y, cursor_x = self.main_window.getyx()
 
         # max, cursor formatted for sake of fixed width / log alignment
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("MAIN: max", main_max_y, main_max_x, self.main_cursor_y, self.main_cursor_x))
+        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]", "MAIN: max", self._main_max_y, self._main_max_x, cursor_y, cursor_x)
 
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("RESULT: max", self.result_window_pos_y , rw_mx, self.result_cursor_y, self.result_cursor_x))
+        self.log("{:<12} [y,x] [{}, {}] contents: {}", "RESULT: line", self.result_line_y, 0, self._last_painted_result)
 
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}] pos: [{}, {}]".format(
-            "INPUT: max", ic_my, ic_mx, self.input_cursor_y, self.input_cursor_x, self.main_cursor_y, self.main_cursor_x)),
+        self.log("{:<12} [y,x] [{}, {}] length: {}", "INPUT: line", self.main_cursor_y, self._prompt_len, len(self._cur_buf))
 
 
     # curses import does not include underscored name
     # type annotation used for IDE hints
     def main(self, main_window: "curses._CursesWindow") -> None:
-        curses.init_pair(1, curses.COLOR_RED, curses.COLOR_WHITE)
-        curses.init_pair(2, curses.COLOR_BLACK, curses.COLOR_GREEN)
+        curses.init_pair(PAIR_ERROR, curses.COLOR_RED, curses.COLOR_WHITE)
+        curses.init_pair(PAIR_DEBUG, curses.COLOR_BLACK, curses.COLOR_GREEN)
+        # pair attributes are constant once initialized. bound here instead of calling color_pair() per use
+        self._err_attr = curses.color_pair(PAIR_ERROR)
+        self._dbg_attr = curses.color_pair(PAIR_DEBUG)
+        self._input_attr = self._dbg_attr if self.debug else 0
 
         # main_window is bound for access to cursor and max positions
         self.main_window = main_window
         main_window.clear()
         main_window.keypad(True) # keypad(True) to differentiate between up arrow and 'A'
         main_window.scrollok(True) # don't crash when we hit the bottom of the window
-        main_window.addstr(self.welcome_prompt)
+        # both are the defaults, pinned: a newline at the bottom scrolls the window and goes out through
+        # doupdate's usual line deltas. no hardware insert/delete line probing, no clear and full repaint
+        main_window.idlok(False)
+        main_window.clearok(False)
+        self._main_max_y, self._main_max_x = main_window.getmaxyx()
+        main_window.addstr(self.welcome_prompt_bytes)
 
-        self.main_cursor_y, self.main_cursor_x = main_window.getyx()
+        self.main_cursor_y, _ = main_window.getyx()
 
         # set the input_line_index to where we can start accepting input
         # the input_line_index does not track with cursor as result gets painted after the prompt/input
         self.input_line_index += self.main_cursor_y
-        self.prompt = "{} {}".format(self.input_line_index, self.prompt_suffix)
+        self._set_prompt(self.input_line_index)
 
         # note that any addstr() will set cursor position to the following x+1 position for a given y
-        main_window.addstr(self.prompt) # prompt belongs to main window, user input goes to input_window
-        main_window.leaveok(True) # the user doesn't interact with main
-        main_window.refresh()
+        main_window.addstr(self.prompt_bytes) # prompt and user input both belong to main window
+        self.debug and main_window.chgat(self.main_cursor_y, self._prompt_len, -1, self._dbg_attr)
         curses.curs_set(1)
-        # set our initial cursor positions post writing our prompts
-        self.main_cursor_y, self.main_cursor_x = main_window.getyx()
-
-        self.new_input_win()
-        self.new_result_win()
-
-        self.debug and self.input_window.bkgd(' ', curses.color_pair(2))
-
-        self.debug and self.log("### window initialized ###")
+        # doupdate() would otherwise poll stdin for pending keys while writing, to cut a flush short.
+        # each pass already flushes once and a paste is drained before painting, so the poll is skipped
+        curses.typeahead(-1)
+
+        self.log("### window initialized ###")
+        # every key getch can hand us is classified by this one lookup: keys with their own handling and the hex
+        # digits map straight to a handler, anything else is invalid input. one hashed lookup per key instead of
+        # walking a chain of compares. built here rather than at import since it needs curses' key constants
+        self._dispatch = {
+            EOF_CHORD: self._on_quit,
+            KEY_Q: self._on_quit,
+            RESIZE_ORD: self._on_resize,
+            curses.KEY_UP: self._on_up,
+        }
+        self._dispatch.update(dict.fromkeys((curses.KEY_BACKSPACE, KEY_BACKSPACE, KEY_DELETE), self._on_backspace))
+        self._dispatch.update(dict.fromkeys((curses.KEY_ENTER, KEY_ENTER), self._on_enter))
+        # iterating bytes gives the ordinals
+        self._dispatch.update(dict.fromkeys(b"0123456789abcdefABCDEF", self._on_input))
+        # per-keystroke lookups bound once. main_window is the only window, so its bound methods stay valid
+        # for the whole loop
+        dispatch_get = self._dispatch.get
+        on_invalid_input = self._on_invalid_input
+        getch = main_window.getch
+        move = main_window.move
+        noutrefresh = main_window.noutrefresh
+        doupdate = curses.doupdate
         while True:
-            self.debug and self.log("looping for input")
-
-            # we get the maximum positions on each loop to handle window resizing and placement
-            self.main_cursor_y, self.main_cursor_x = main_window.getyx()
-
-            # the Y coordinate will be 0 unless the contents of the input window are multiple lines
-            # this is not the global position on screen
-            self.input_cursor_y, self.input_cursor_x = self.input_window.getyx()
-
-            # the Y coordinate will be 0 unless the contents of the result window are multiple lines
-            # this is not the global position on screen
-            self.result_cursor_y, self.result_cursor_x = self.result_window.getyx()
+            self.log("looping for input")
             self.debug and self.report_positions()
 
+            # painting while handling a key only changes main_window's contents, which are flushed here in a
+            # single burst of output before blocking on the next key. the cursor is put back at the end of
+            # the input first, so that is where it lands
+            move(self.main_cursor_y, self.input_line_cursor_x())
+            noutrefresh()
+            doupdate()
+
             try:
                 # loop for next input
-                i = self.input_window.getch()
-                self.input_window.refresh()
+                i = getch()
 
-                # ^C exits.  let ^D quit, let "q" quit
-                if i == EOF_CHORD or i == KEY_Q:
-                    curses.endwin()
+                # a handler returns True when the application should exit
+                if dispatch_get(i, on_invalid_input)(i):
                     return
 
-                if i == RESIZE_ORD:
-                    continue
-
-                # if input is up allow, set user input to the last input
-                # very likely the user will then backspace, edit, hit enter
-                if i == curses.KEY_UP:
-                    self.debug and self.log("replacing current input: {c} with last input: {p}".format(c=self.current_input, p=self.last_input))
-                    # throw away whatever we have built up for current_input
-                    # and replace with the last_input that was valid for conversion
-                    self.current_input = self.last_input
-                    # get the result window out of the way in case it's on the last return. else this will
-                    # stomp on the result return
-                    self.result_window_move()
-                    # result not valid anymore
-                    self.result_window_wipe()
-                    self.input_window_replace(self.current_input)
-                    self.input_window.refresh()
-                    continue
-
-                # if i == curses.KEY_LEFT:
-                # input_window.move
-                # handle delete + replace on current char
-                # if at the beginning of input...
-
-                # if i == curses.KEY_RIGHT:
-                # input_window.move
-                # handle delete + replace on current char
-                # if at the end of input...
-
-                # handle backspace
-                if i in (curses.KEY_BACKSPACE, KEY_BACKSPACE, KEY_DELETE):
-                    self.report_positions()
-                    if len(self.current_input) == 0:
-                        self.debug and self.log("no text left to delete")
-                        continue
-
-                    self.current_input = self.current_input[:-1]
-                    self.input_window_replace(self.current_input)
-
-                    # if we previously had an error, the result window will have a background used for errors
-                    self.result_window_wipe()
-                    self.result_window_move()
-                    # if we send an empty string to addstr, we'll get back an error
-                    result = ""
-                    if len(self.current_input) > 0:
-                        result = hex_to_dec_str(self.current_input)
-                        self.result_window.addstr(0,0, result)
-
-                    self.debug and self.log("wrote result after backspace: " + result)
-
-                    self.result_window.refresh()
-                    self.input_window.refresh()
-                    continue
-
-                # KEY_ENTER is some numeric keyboards
-                # macOS sends a \lf with the <return> key
-                # treat these as their numeric inputs (no ord)
-                if i == curses.KEY_ENTER or i == KEY_ENTER:
-                    self.result_window.leaveok(True) # needed?
-                    # if we have an error, clear it out. no output needs preservation.
-                    if len(self.error) > 0:
-                        self.error = ""
-                        # clear window contents and refresh to update it
-                        self.debug and self.log("updating clearing error from result window")
-                        # if we previously had an error, the result window will have a background used for errors
-                        self.result_window_wipe()
-                        # do not clear any other windows, this is dismissing the error only
-                        continue
-
-                    # just ignore errant or idle return presses
-                    if self.current_input.strip() == "":
-                        continue
-
-                    self.input_line_index += 1
-                    self.prompt = "{} {}".format(self.input_line_index, self.prompt_suffix)
-
-                    # wipe to clear the window for main_window to write to the previously occupied space
-                    self.input_window_wipe()
-                    # write the input that was entered into the main_window to mimic
-                    # preserving the input window. we use the input window only for active input
-                    main_window.addstr(self.current_input.strip())
-
-                    # clear over input line with a return before writing our result
-                    # this is bypassing the input window
-                    main_window.addstr("\n")
-                    # set current input minus confirmation
-                    result = hex_to_dec_str(self.current_input)
-
-                    # on confirmation, we send the result to the main screen, not the live-updating results window
-                    # we do this to advance the "cursor" of window anchoring
-                    # e.g.
-                    #  [ main: >>> ] [ user input ]
-                    #  [ live updating results]
-                    # <enter>
-                    #  [ main: >>> ] [ user input ]
-                    #  [ main: result ]
-                    #  [ main: >>> ] [ user input ]
-                    #  [ live updating results]
-                    main_window.addstr(result, curses.A_STANDOUT)
-
-                    # with output provided, now store last result for recall
-                    self.last_input = self.current_input
-                    self.current_input = ""
-
-                    # redraw prompt by moving main window line
-                    main_window.addstr("\n")
-                    main_window.addstr(self.prompt)
-                    # update main cursor location, which is used to calculate where to draw our input box
-                    self.main_cursor_y, self.main_cursor_x = main_window.getyx()
-                    self.debug and self.report_positions()
-                    # main_window.refresh() to redraw our prompt for input
-                    main_window.refresh()
-
-                    # now move input box, clearing out any contents first
-                    self.manage_input_subwin(self.input_line_index)
-                    # this wipe clears any content left in the window post-move,
-                    # such as text likely shifted down leftover from our prior input space that was written into by main_window
-                    self.input_window_wipe()
-                    self.input_window_move(self.main_cursor_y, len(self.prompt))
-                    self.input_window.refresh()
-                    self.debug and self.log("result recorded, input window adjusted for new input")
-                    continue
-
-                # else, we have user input pending conversion
-                # convert ordinal to Unicode code point
-                i_chr = chr(i)
-
-                if not is_hex(i_chr):
-                    self.result_window_move()
-                    self.result_window_set_invalid_input_error(i, i_chr)
-                else:
-                    # if we previously had an error, the result window will have a background used for errors
-                    if len(self.error) > 0:
-                        self.error = ""
-                        self.result_window_wipe()
-
-                    # output to prompt line and add user input to existing current_input
-                    self.current_input += i_chr
-                    self.input_window.addstr(i_chr)
-
-                    # move the result window to make sure we're not stomping on main's output
-                    # then clean our current output buffer
-                    self.result_window_move()
-                    self.result_window_wipe()
-
-                    result = hex_to_dec_str(self.current_input)
-                    self.result_window.addstr(hex_to_dec_str(self.current_input))
-                    self.debug and self.log("wrote result: " + result)
-                    # self.result_window.refresh() required to paint real-time conversion result
-                    self.result_window.refresh()
-
             # catch ^c and EOF, clean exit
             except (KeyboardInterrupt, EOFError):
                 curses.endwin()
                 print("exception caught")
                 return
 
-        # get next keypress
-        stdscr.getkey()
+    # ^C exits.  let ^D quit, let "q" quit
+    def _on_quit(self, i):
+        curses.endwin()
+        return True
+
+    def _on_resize(self, i):
+        main_window = self.main_window
+        self._main_max_y, self._main_max_x = main_window.getmaxyx()
+        self._set_input_room()
+        # shrinking can cut off the prompt's line. main scrolls up a line so it can be redrawn on a
+        # fresh last line, without painting over what is there
+        if self.main_cursor_y >= self._main_max_y:
+            main_window.scroll(1)
+            self.main_cursor_y = self._main_max_y - 1
+        main_window.addnstr(self.main_cursor_y, 0, self.prompt_bytes, self._main_max_x - 1)
+        # the input and result lines are repainted for the new width
+        self._last_painted_input = None
+        self.input_line_replace(self.current_input)
+        self.result_line_repaint()
+
+    # if input is up allow, set user input to the last input
+    # very likely the user will then backspace, edit, hit enter
+    def _on_up(self, i):
+        # recalling what is already being edited is a no-op
+        if self.current_input == self.last_input and len(self.error) == 0:
+            return
+
+        self.log("replacing current input: {c} with last input: {p}", c=self.current_input, p=self.last_input)
+        # throw away whatever we have built up for current_input
+        # and replace with the last_input that was valid for conversion
+        self.current_input = self.last_input
+        # recompute once from the recalled input, then continue incrementally
+        self._cur_val = int(self.last_input or "0", 16)
+        # result not valid anymore
+        self.result_line_wipe()
+        self.input_line_replace(self.current_input)
+
+    # handle backspace
+    def _on_backspace(self, i):
+        self.debug and self.report_positions()
+        if len(self._cur_buf) == 0:
+            self.log("no text left to delete")
+            return
 
+        del self._cur_buf[-1:]
+        # drop the last nibble
+        self._cur_val >>= 4
+        self.input_line_backspace()
+
+        result = ""
+        if len(self._cur_buf) > 0:
+            result = f"{self._cur_val}"
+
+        if result != self._last_painted_result:
+            self.result_line_move()
+            # if we previously had an error, the result line has the error colors,
+            # which result_line_replace paints over
+            self.result_line_replace(result)
+            self.log("wrote result after backspace: {}", result)
+
+    # KEY_ENTER is some numeric keyboards
+    # macOS sends a \lf with the <return> key
+    # treat these as their numeric inputs (no ord)
+    def _on_enter(self, i):
+        # if we have an error, clear it out. no output needs preservation.
+        if len(self.error) > 0:
+            self.error = ""
+            self.log("updating clearing error from result line")
+            # if we previously had an error, the result line has the error colors
+            self.result_line_wipe()
+            # do not clear anything else, this is dismissing the error only
+            return
 
-    # check clear usage on input window, compare against old main setup
-    # if old main setup didn't clear() that would account for line jumping
-    # we then want input box to stay on the same line as prompt
-    # result box should be after input/prompt box combo
+        # just ignore errant or idle return presses
+        if len(self._cur_buf) == 0:
+            return
+
+        # write the input that was entered, in full, over the (possibly clipped) input line.
+        # the trailing return clears the rest of the input line before writing our result
+        # the enter is three writes: this input and return, the result in standout, then the return and next prompt
+        main_window = self.main_window
+        confirmed = self.current_input
+        main_window.addstr(self.main_cursor_y, self._prompt_len, confirmed + "\n")
+        result = f"{self._cur_val}"
+
+        # on confirmation, the result is written to main_window as a permanent line, over the live result
+        # e.g.
+        #  [ main: >>> ] [ user input ]
+        #  [ live updating results]
+        # <enter>
+        #  [ main: >>> ] [ user input ]
+        #  [ main: result ]
+        #  [ main: >>> ] [ user input ]
+        #  [ live updating results]
+        main_window.addstr(result, curses.A_STANDOUT)
+        # with output provided, now store last result for recall
+        self.last_input = confirmed
+        self._cur_buf.clear()
+        self._cur_val = 0
+
+        self.input_line_index += 1
+        self._set_prompt(self.input_line_index)
+
+        # draw the next prompt on a fresh line. the line it lands on may still hold old text
+        # (e.g. from before a resize), cleared past the prompt
+        main_window.addstr(b"\n" + self.prompt_bytes)
+        main_window.clrtoeol()
+        self.main_cursor_y, _ = main_window.getyx()
+        self.debug and main_window.chgat(self.main_cursor_y, self._prompt_len, -1, self._dbg_attr)
+        # the result line below the new prompt hasn't been painted on
+        self._last_painted_input = ""
+        self._last_painted_result = ""
+        self.result_line_y = self.main_cursor_y + 1
+        self.debug and self.report_positions()
+        self.log("result recorded, input line moved for new input")
+
+    # any key without a handler isn't valid hex, special keys (e.g. KEY_LEFT) included.
+    # the ordinal is only converted to a Unicode code point for the error message, and only
+    # when it is printable ascii. special keys and control chars are reported by ordinal alone
+    def _on_invalid_input(self, i):
+        self.result_line_move()
+        self.result_line_set_invalid_input_error(i, chr(i) if 32 <= i < 127 else "<nonprintable>")
+
+    # else, we have user input pending conversion. the dispatch table only sends hex digits here
+    def _on_input(self, i):
+        # the ordinal tables are module globals, bound as locals they are read with a fast local load per key
+        hex_lut = _HEX_LUT
+        hex_val = _HEX_VAL
+
+        # if we previously had an error, the result line has the error colors. the result painted below is
+        # written over it from the first column, which drops them without wiping the line first
+        if len(self.error) > 0:
+            self.error = ""
+
+        # shift in the new nibble instead of re-converting current_input
+        batch = bytearray((i,))
+        value = (self._cur_val << 4) | hex_val[i]
+
+        # a paste shows up as a burst of pending keys. drain any hex that is already waiting
+        # so the burst costs one paint instead of one per char
+        main_window = self.main_window
+        getch = main_window.getch
+        main_window.nodelay(True)
+        while True:
+            j = getch()
+            if j == -1:
+                break
+            if j > 0xff or not hex_lut[j]:
+                # not hex, hand it back for the next pass through the loop to handle
+                curses.ungetch(j)
+                break
+            batch.append(j)
+            value = (value << 4) | hex_val[j]
+        main_window.nodelay(False)
+
+        # output to prompt line and add user input to existing current_input
+        self._cur_buf += batch
+        self.input_line_append(bytes(batch))
+        self._cur_val = value
+        result = f"{self._cur_val}"
+
+        # make sure there is a line under the prompt for the result
+        self.result_line_move()
+        # leading zeros don't change the result, leave the line alone
+        if result != self._last_painted_result:
+            # overwrite the live result with the real-time conversion result
+            self.result_line_replace(result)
+            self.log("wrote result: {}", result)
+
+
+# _cli_convert converts a single argument for the non-interactive mode.  the result is always ascii, so it
+# is written to the stdout fd with os.write instead of going through print and the text layer
+def _cli_convert(data):
+    to_str = _int_to_str_fast
+    if len(data) > GMPY2_MIN_LEN:
+        # GMP's subquadratic base conversion beats _int_to_str_fast
+        to_str = _load_gmpy2_digits() or _int_to_str_fast
+
+    try:
+        result = to_str(_hex_to_int_fast(data))
+    except ValueError:
+        result = INVALID_HEX_MESSAGE
+    os.write(1, result.encode("ascii") + b"\n")
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    # a lone positional argument (`htoi.old.py beef`) is converted before argparse is even imported,
+    # for a one-shot conversion startup is most of the run time
+    if len(sys.argv) == 2 and sys.argv[1][:1] not in ("", "-"):
+        _cli_convert(sys.argv[1])
+        sys.exit(0)
+
     # minimal imports until we know the runtime mode
     import argparse
 
@@ -494,17 +701,17 @@ if __name__ == "__main__":
     # if we received positional args
     # arguments are already treated as strings for input
     if args.stdin_data and len(args.stdin_data) > 0:
-        print(hex_to_dec(args.stdin_data))
+        _cli_convert(args.stdin_data)
     else:
+        # input grouping is kept separate for sake of run speed for non-interactive mode.
+        # imported ahead of the try so that a missing curses surfaces as an ImportError rather than
+        # a NameError from `except curses.error`, and is loaded before the event loop starts
+        # curses is imported to support up arrow input
+        import curses
+
         htoi = Htoi(debug=args.debug)
 
         try:
-            # input grouping is kept separate for sake of run speed for non-interactive mode
-            import curses
-            from math import log10 # only required in interactive mode for line count
-            from sys import exit # for setting exit code when interactive mode throws an uncaught exception
-
-            # curses is imported to support up arrow input
             stdscr = curses.initscr()
             curses.start_color()
             stdscr.keypad(True) # detect special chars like key-up, otherwise key-up looks like 'A'
@@ -516,6 +723,6 @@ if __name__ == "__main__":
                 htoi.log(traceback.format_exc())
                 raise e
 
-            exception_summary = "Could not initialize window: {e_str}".format(e_str=e)
+            exception_summary = f"Could not initialize window: {e}"
             print(exception_summary)
-            exit(1)
+            sys.exit(1)
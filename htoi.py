@@ -10,14 +10,42 @@ KEY_Q = ord("q") # a 'q' in any position at any time will exit
 KEY_BACKSPACE = 127 # ord('\x7f')
 KEY_DELETE = 330
 
-# type annotation because try/except value check
-# instead of pythonic guardrail crash
+# color pair numbers for debug window backgrounds
+BG_RED = 1
+BG_GREEN = 2
+BG_BLUE = 3
+
+# 1 at the index of every ascii hex digit, 0 elsewhere.
+# filled by slice over '0'-'9', 'A'-'F' and 'a'-'f' rather than a 256 step loop, every run (the CLI too) builds these
+_HEX_MASK = bytearray(256)
+_HEX_MASK[48:58] = b"\x01" * 10
+_HEX_MASK[65:71] = _HEX_MASK[97:103] = b"\x01" * 6
+_HEX_MASK = bytes(_HEX_MASK)
+# nibble value (0-15) at the index of every ascii hex digit, used to grow the result one keystroke at a time.
+# indexed by the getch ordinal, so the lookup doesn't need a chr()
+_HEX_VAL = bytearray(256)
+_HEX_VAL[48:58], _HEX_VAL[65:71], _HEX_VAL[97:103] = range(10), range(10, 16), range(10, 16)
+_HEX_VAL = bytes(_HEX_VAL)
+
+# whitelist check against _HEX_MASK before raising and catching ValueError from int().
+# a single char is one table index, without encoding the string first
 def is_hex(s: str) -> bool:
+    if len(s) == 1:
+        o = ord(s)
+        return o < 256 and _HEX_MASK[o] == 1
+    if s and s.isascii() and all(_HEX_MASK[c] for c in s.encode("ascii")):
+        return True
+    # anything else int() still takes (0x prefix, surrounding whitespace, underscores) goes the slow way
     try:
         int(s, 16)
-        return True
     except ValueError:
         return False
+    return True
+
+# single keystroke check on the ordinal from getch, before paying for a chr().
+# '0'-'9' by range, then |0x20 folds 'A'-'F' onto 'a'-'f' so one more range covers both cases
+def _is_hex_ord(i: int) -> bool:
+    return 0 <= i - 48 < 10 or 0 <= (i | 0x20) - 97 < 6
 
 def hex_to_dec(input_value):
     """Convert input_value from hex to decimal. Accepts string returns string.
@@ -43,19 +71,99 @@ def hex_to_dec(input_value):
         return -1
     return ret
 
+# inputs longer than this many hex digits are formatted with gmpy2 when it is installed
+GMPY2_MIN_LEN = 64
+
+# _load_gmpy2_digits returns a gmpy2 based int to decimal string conversion, or None if gmpy2 is not installed.
+# str() of a huge int is quadratic in CPython, GMP's base conversion is subquadratic.
+# imported lazily so that short input never pays for it, and the import is only attempted once
+def _load_gmpy2_digits():
+    global _gmpy2_digits
+    if _gmpy2_digits is False:
+        try:
+            import gmpy2
+        except ImportError:
+            _gmpy2_digits = None
+        else:
+            mpz = gmpy2.mpz
+            _gmpy2_digits = lambda n: mpz(n).digits(10)
+    return _gmpy2_digits
+
+# False until _load_gmpy2_digits has looked for gmpy2, then the conversion or None
+_gmpy2_digits = False
+
+# ints up to this many bits are handed straight to str(). ~1233 decimal digits, well under the 4300 digit
+# limit python 3.11+ places on str(int)
+_STR_LEAF_BITS = 4096
+
+# _int_to_str_fast formats an int of any size in decimal.  str() on a big int is quadratic, and on python
+# 3.11+ raises ValueError past sys.get_int_max_str_digits(), which happens for ~3600+ hex digits of input.
+# the value is split in halves with divmod by 10^(18 * 2^k), each low half zero padded to its width, until the
+# pieces are small enough for str()
+def _int_to_str_fast(n):
+    if n.bit_length() <= _STR_LEAF_BITS:
+        return str(n)
+
+    # powers[k] == 10^(18 * 2^k), until powers[-1]^2 would exceed n
+    powers = [10 ** 18]
+    while True:
+        square = powers[-1] * powers[-1]
+        if square > n:
+            break
+        powers.append(square)
+
+    # x < powers[k + 1].  pad is the digit count x must be zero filled to, 0 for the leading (unpadded) part
+    def digits(x, k, pad):
+        if k < 0 or x.bit_length() <= _STR_LEAF_BITS:
+            return str(x).zfill(pad)
+        hi, lo = divmod(x, powers[k])
+        width = 18 << k
+        if not pad and not hi:
+            return digits(lo, k - 1, 0)
+        return digits(hi, k - 1, max(pad - width, 0)) + digits(lo, k - 1, width)
+
+    return digits(n, len(powers) - 1, 0)
+
+# the interactive loop keeps its own running int and never calls this, it's for library callers.
+# converts inline rather than through hex_to_dec, keeping its -1 for invalid input
 def hex_to_dec_str(input_value):
-    return str(hex_to_dec(input_value))
+    # only the parse is guarded: str() also raises ValueError past the 3.11+ digit limit, which isn't bad input
+    try:
+        value = int(input_value, 16)
+    except ValueError:
+        return "-1"
+    if len(input_value) > GMPY2_MIN_LEN:
+        mpz_digits = _load_gmpy2_digits()
+        if mpz_digits is not None:
+            return mpz_digits(value)
+    return _int_to_str_fast(value)
+
+
+# max, cursor formatted for sake of fixed width / log alignment in report_positions
+_REPORT_TMPL = (
+    "MAIN: max     [y,x] [%d, %d] cursor: [%d, %d]\n"
+    "INPUT: max    [y,x] [%d, %d] cursor: [%d, %d]\n"
+    "FEEDBACK: max [y,x] [%d, %d] cursor: [%d, %d]\n"
+    "HISTORY: max  [y,x] [%d, %d] cursor: [%d, %d]"
+)
+
+# shown in the feedback window for a rejected keystroke. only printable ascii is echoed back as a character
+_ERR_TMPL = "input not valid hexadecimal character. ord: %d chr: %s"
+
+# stands in for Htoi.log when debug is off
+def _noop(*args, **kwargs):
+    pass
 
 
 class WindowTooSmallException(Exception):
     def __init__(self, window_size, required_size):
         self.window_size = window_size
         self.required_size = required_size
-        super().__init__("window size {} is under required height of {} [0 indexed]".format(self.window_size, self.required_size))
+        super().__init__(f"window size {self.window_size} is under required height of {self.required_size} [0 indexed]")
 
 
 # Htoi is a ncurses application for converting from hex to decimal
-# note that an intentional chain of `if` statements are used instead of
+# note that keys are dispatched through a dict of handler methods instead of
 # python 3.10's switch/match for purposes of wider availability.
 #
 # a rough layout sketch is:
@@ -73,30 +181,46 @@ class Htoi:
 
     def __init__(self, debug=False):
         self.debug=debug
-        self.bg_red = 1
-        self.bg_green = 2
-        self.bg_blue = 3
+        # without debug, logging is a no-op so nothing is formatted or written and call sites need no guard.
+        # python -O compiles debug logging out entirely
+        self.log = self._log_impl if debug and __debug__ else _noop
+        # color pair attributes for the debug window backgrounds, looked up once the pairs exist in main
+        self._attr_red = 0
+        self._attr_green = 0
+        self._attr_blue = 0
 
         self.prompt = "htoi > "
 
-        self.main_window: Optional["curses._CursesWindow"] = None  # window bound in main
-        self.input_window: Optional["curses._CursesWindow"] = None  # window bound in main
-        self.feedback_window: Optional["curses._CursesWindow"] = None  # window bound in main
-        self.history_window: Optional["curses._CursesWindow"] = None  # window bound in main
+        self.main_window: "Optional[curses._CursesWindow]" = None  # window bound in main
+        self.input_window: "Optional[curses._CursesWindow]" = None  # window bound in main
+        self.feedback_window: "Optional[curses._CursesWindow]" = None  # window bound in main
+        self.history_window: "Optional[curses._CursesWindow]" = None  # window bound in main
 
         # window positions are 0 indexed
         # todo: dynamically adjust this to equal feedback_window_start position
         self.feedback_window_start_y = 1
         self.history_window_start_y = 2
+        self._main_max_y = 0 # cached main_window height, set in main
+        # subwindow widths only change when a resize re-creates them, cached by their *_new
+        self._feedback_max_x = 0
+        self._history_max_x = 0
 
         self.last_input = ""
         self.current_input = ""
+        # integer value of current_input, kept in step with it so a keystroke never re-parses the whole input
+        self._value = 0
+        self.last_value = 0
         # storing error in the function scope allows
         # for cheaply checking error status instead of dealing with a window object
         self.error = ""
         # history is tracked for more control over rendering than only dumping to screen
-        from collections import deque # used for results instead of linear time lists
         self.history = deque([], maxlen=250)
+        # windows are only pushed to the virtual screen when something was written to them
+        self._history_dirty = False
+        self._feedback_dirty = False
+        self._input_dirty = False
+        # text last written to the feedback window, None until the first write
+        self._last_feedback = None
 
 
     def input_window_new(self):
@@ -106,10 +230,10 @@ class Htoi:
         self.input_window = self.main_window.subwin(1, 0, main_y, main_x)
         self.input_window.scrollok(True) # while we don't expect to draw a newline, we could wrap on the X axis
         self.input_window.keypad(True) # keypad(True) to differentiate between up arrow and 'A'
-        self.debug and self.input_window.bkgd(' ', curses.color_pair(self.bg_green))
+        self.debug and self.input_window.bkgd(' ', self._attr_green)
 
     def input_window_replace(self, contents):
-        self.debug and self.log("replacing input window with contents: {}".format(contents))
+        self.log("replacing input window with contents: {}", contents)
         self.input_window.erase()
         self.input_window.addstr(contents)
 
@@ -120,7 +244,28 @@ class Htoi:
         self.feedback_window = self.main_window.subwin(1, 0, self.feedback_window_start_y, 0)
         self.feedback_window.scrollok(True) # result could overflow in X dimension
         self.feedback_window.leaveok(True) # leaveok prevents the cursor from jumping to window after write. see also: curses.filter() before initscr()
-        self.debug and self.feedback_window.bkgd(' ', curses.color_pair(self.bg_red))
+        self.debug and self.feedback_window.bkgd(' ', self._attr_red)
+        _, self._feedback_max_x = self.feedback_window.getmaxyx()
+
+    # show contents, in standout, as the only thing in the feedback window. skipped when it is already what's shown
+    # when the old and new contents both fit on the line, the chars they start with are kept and only
+    # the rest is rewritten. a typed digit usually changes just the tail of the result
+    def feedback_window_replace(self, contents):
+        last = self._last_feedback
+        if contents == last:
+            return
+        feedback_max_x = self._feedback_max_x
+        if last and contents and len(last) < feedback_max_x and len(contents) < feedback_max_x:
+            same = len(os.path.commonprefix((last, contents)))
+            self.feedback_window.move(0, same)
+            self.feedback_window.clrtoeol()
+            same < len(contents) and self.feedback_window.addstr(contents[same:], curses.A_STANDOUT)
+        else:
+            self.feedback_window.erase()
+            # if we send an empty string to addstr, we'll get back an error
+            contents and self.feedback_window.addstr(contents, curses.A_STANDOUT)
+        self._last_feedback = contents
+        self._feedback_dirty = True
 
     def history_window_new(self):
         # start new window below feedback window, with no defined column max so we don't have to resize
@@ -128,44 +273,91 @@ class Htoi:
         self.history_window = self.main_window.subwin(self.history_window_start_y, 0)
         self.history_window.scrollok(True)
         self.history_window.leaveok(True)
-        self.debug and self.history_window.bkgd(' ', curses.color_pair(self.bg_blue))
-
-
-    @staticmethod
-    def log(message):
-        with open("debug.log", "a") as f:
-            time_marker = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-            f.write("[{timeMarker}] {msg}\n".format(timeMarker=time_marker, msg=message))
+        self.debug and self.history_window.bkgd(' ', self._attr_blue)
+
+        # only as many entries as the window has rows can ever be seen, so cap history there.
+        # the most recent entries are at the left of the deque and are the ones kept
+        history_max_y, self._history_max_x = self.history_window.getmaxyx()
+        self.history = deque(islice(self.history, history_max_y), maxlen=max(history_max_y, 1))
+
+    # open up as many rows as entry wraps to at the top of the history window and draw it there,
+    # letting curses push older entries down and off the bottom instead of re-drawing all of them.
+    # entries are never empty, and one that exactly fills its last row doesn't need a row after it
+    def history_window_push(self, entry):
+        # insdelln leaves the cursor where it was, so the entry is written from the top left without another move
+        self.history_window.move(0, 0)
+        self.history_window.insdelln((len(entry) - 1) // self._history_max_x + 1)
+        self.history_window.addstr(entry)
+        self._history_dirty = True
+
+    # stage every window that changed and flush them to the terminal in one write, or do nothing if none did.
+    # input_window is always staged last when anything is flushed so the physical cursor lands back on user input
+    def _commit(self):
+        if not (self._history_dirty or self._feedback_dirty or self._input_dirty):
+            return
+        if self._history_dirty:
+            self.history_window.noutrefresh()
+        if self._feedback_dirty:
+            self.feedback_window.noutrefresh()
+        self.input_window.noutrefresh()
+        self._history_dirty = self._feedback_dirty = self._input_dirty = False
+        curses.doupdate()
+
+    # datetime is only imported the first time something is logged, interactive mode without --debug never needs it
+    _datetime = None
+    _utc = None
+    _time = None
+    # the formatted timestamp only changes once a second, so strftime runs once per unix second
+    # and the string is reused for every other line logged within it
+    _stamp_sec = -1
+    _stamp = ""
+    # debug.log is opened once and held, line buffered so a crash still leaves every line written
+    _log_fh = None
+
+    # message is only formatted with args/kwargs here, so a disabled logger never pays for it
+    @classmethod
+    def _log_impl(cls, message, *args, **kwargs):
+        if args or kwargs:
+            message = message.format(*args, **kwargs)
+        if cls._datetime is None:
+            from datetime import datetime, timezone
+            from time import time
+            cls._datetime, cls._utc, cls._time = datetime, timezone.utc, time
+        if cls._log_fh is None:
+            import atexit
+            cls._log_fh = open("debug.log", "a", buffering=1, encoding="utf-8")
+            atexit.register(cls._log_fh.close)
+        sec = int(cls._time())
+        if sec != cls._stamp_sec:
+            cls._stamp = cls._datetime.fromtimestamp(sec, cls._utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            cls._stamp_sec = sec
+        cls._log_fh.write(f"[{cls._stamp}] {message}\n")
 
     def report_positions(self):
-        self.debug and self.log("reading main window coordinates")
-        main_max_y, main_max_x = self.main_window.getmaxyx()
-        main_cursor_y, main_cursor_x = self.main_window.getyx()
+        self.log("reading main window coordinates")
+        # (max y, max x, cursor y, cursor x) per window, in _REPORT_TMPL order. each window attribute is read once
+        positions = ()
+        for window in (self.main_window, self.input_window, self.feedback_window, self.history_window):
+            positions += window.getmaxyx() + window.getyx()
 
-        input_max_y, input_max_x = self.input_window.getmaxyx()
-        input_cursor_y, input_cursor_x = self.input_window.getmaxyx()
-
-        feedback_max_y, feedback_max_x = self.feedback_window.getmaxyx()
-        feedback_cursor_y, feedback_cursor_x = self.feedback_window.getmaxyx()
-
-        history_max_y, history_max_x = self.history_window.getmaxyx()
-        history_cursor_y, history_cursor_x = self.history_window.getyx()
-
-        # max, cursor formatted for sake of fixed width / log alignment
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("MAIN: max", main_max_y, main_max_x, main_cursor_y, main_cursor_x))
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("INPUT: max", input_max_y, input_max_x, input_cursor_y, input_cursor_x))
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("FEEDBACK: max", feedback_max_y, feedback_max_x, feedback_cursor_y, feedback_cursor_x))
-        self.log("{:<12} [y,x] [{}, {}] cursor: [{}, {}]".format("HISTORY: max", history_max_y , history_max_x, history_cursor_y, history_cursor_x))
+        # all four windows go out as one log write
+        self.log(_REPORT_TMPL % positions)
 
 
     # curses import does not include underscored name
     # type annotation used for IDE hints
     def main(self, main_window: "curses._CursesWindow") -> None:
         # with window having been init, we can no define new background
-        curses.init_pair(self.bg_red, curses.COLOR_BLACK, curses.COLOR_RED)
-        curses.init_pair(self.bg_green, curses.COLOR_BLACK, curses.COLOR_GREEN)
-        curses.init_pair(self.bg_blue, curses.COLOR_BLACK, curses.COLOR_BLUE)
+        curses.init_pair(BG_RED, curses.COLOR_BLACK, curses.COLOR_RED)
+        curses.init_pair(BG_GREEN, curses.COLOR_BLACK, curses.COLOR_GREEN)
+        curses.init_pair(BG_BLUE, curses.COLOR_BLACK, curses.COLOR_BLUE)
+        self._attr_red = curses.color_pair(BG_RED)
+        self._attr_green = curses.color_pair(BG_GREEN)
+        self._attr_blue = curses.color_pair(BG_BLUE)
         curses.curs_set(1)  # visible cursor
+        # doupdate() would otherwise poll stdin for pending keys while writing, to cut a flush short.
+        # each pass already flushes once and drains queued keys itself, so the poll is skipped
+        curses.typeahead(-1)
 
         # main_window is bound for access to cursor and max positions
         self.main_window = main_window
@@ -174,12 +366,15 @@ class Htoi:
         main_window.scrollok(True) # don't crash when we hit the bottom of the window
         main_window.addstr(self.prompt)
         main_window.leaveok(True)
-        main_window.refresh()
+        # queued only, the first _commit flushes it along with the subwindows
+        main_window.noutrefresh()
 
         minimum_required_y = max(self.feedback_window_start_y, self.history_window_start_y)
         starting_max_y, _ = main_window.getmaxyx()
         if starting_max_y - 1 < minimum_required_y:
             raise WindowTooSmallException(starting_max_y - 1 , minimum_required_y)
+        # dimensions only change on resize, so they are read once here and again in the resize branch
+        self._main_max_y = starting_max_y
 
         self.input_window_new()
         self.feedback_window_new()
@@ -188,234 +383,445 @@ class Htoi:
         self.debug and self.feedback_window.addstr("feedback window")
         self.debug and self.history_window.addstr("history window")
 
-        # we discover if windows / layouts failed at refresh time
-        self.feedback_window.refresh()
-        self.history_window.refresh()
-        self.input_window.refresh()
+        # we discover if windows / layouts failed at refresh time, which is now the first _commit at the top of
+        # the input loop. it stages every window and draws the initial screen in a single doupdate
+        self._history_dirty = self._feedback_dirty = self._input_dirty = True
+
+        self.log("### window initialized ###")
+        # every key getch can hand us is classified by this one lookup: keys with their own handling and the hex
+        # digits map straight to a handler, anything else is invalid input.
+        # built here rather than at import since it needs curses' key constants
+        self._dispatch = {
+            EOF_CHORD: self._on_quit,
+            KEY_Q: self._on_quit,
+            curses.KEY_UP: self._on_up,
+        }
+        self._dispatch.update(dict.fromkeys(_RESIZE_KEYS, self._on_resize))
+        self._dispatch.update(dict.fromkeys(_BACKSPACE_KEYS, self._on_backspace))
+        self._dispatch.update(dict.fromkeys(_ENTER_KEYS, self._on_enter))
+        # iterating bytes gives the ordinals
+        self._dispatch.update(dict.fromkeys(b"0123456789abcdefABCDEF", self._on_input))
+        # the per-keystroke lookups are bound once as locals. input_window is re-created on resize so getch is not
+        dispatch_get = self._dispatch.get
+        on_invalid_input = self._on_invalid_input
+        commit = self._commit
 
-        self.debug and self.log("### window initialized ###")
         while True:
-            self.debug and self.log("looping for input")
+            self.log("looping for input")
             self.debug and self.report_positions()
             try:
                 # if our screen is too small for output, don't render
-                main_max_y, main_max_x = main_window.getmaxyx()
-                if main_max_y - 1 < minimum_required_y:
-                    raise WindowTooSmallException(starting_max_y - 1 , minimum_required_y)
+                if self._main_max_y - 1 < minimum_required_y:
+                    raise WindowTooSmallException(self._main_max_y - 1 , minimum_required_y)
 
-                # loop for next input
+                # flush whatever the previous pass staged, then loop for next input
+                commit()
                 i = self.input_window.getch()
-                self.debug and self.log("read char: {}".format(i))
-                self.input_window.refresh()
+                self.log("read char: {}", i)
 
-                # ^C exits.  let ^D quit, let "q" quit
-                if i == EOF_CHORD or i == KEY_Q:
-                    curses.endwin()
+                # a handler returns True when the application should exit
+                if dispatch_get(i, on_invalid_input)(i):
                     return
 
-                if i == RESIZE_ORD or i == curses.KEY_RESIZE:
-                    # todo: this probably requires a window.resize in addition to curses.resizeterm
-
-                    new_y, new_x = main_window.getmaxyx()
-
-                    curses.resize_term(new_y, new_x)
-                    self.debug and self.log("windows refreshed after resize")
-                    self.debug and self.report_positions()
-
-                    # refresh will throw:
-                    # Python(97765,0x2094ddf00) malloc: Incorrect checksum for freed object 0x11b03ca00: probably modified after being freed.
-                    # Corrupt value: 0x3200000000
-                    # Python(97765,0x2094ddf00) malloc: *** set a breakpoint in malloc_error_break to debug
-                    #
-                    # when inputting and re-sizing while inputting text. if you input text, then scroll beyond, then within buffer, you can force this.
-                    # this happens even with a clear() instead of an erase
-                    self.debug and self.log("resize => erasing history window")
-                    self.history_window.erase()
-
-                    del self.history_window
-                    # create a new window instead of trying to
-                    self.history_window_new()
-
-                    # UAF?
-                    # addressable_history = "\n".join(self.history)
-                    # self.history_window.addstr(addressable_history)
-                    self.debug and self.log("resize => re-writing history")
-                    for res in self.history:
-                        self.history_window.addstr(res + "\n")
-
-                    self.debug and self.log("resize => refreshing input")
-                    self.history_window.refresh()
-                    self.main_window.refresh()
-
-                    self.debug and self.log("resize => history window resize complete")
-                    self.debug and self.report_positions()
-
-                    continue
-
-                # if input is up allow, set user input to the last input
-                # very likely the user will then backspace, edit, hit enter
-                if i == curses.KEY_UP:
-                    # if no previous input, just continue after clearing any errors
-                    if not self.last_input:
-                        self.feedback_window.erase()
-                        self.feedback_window.refresh()
-                        continue
-
-                    self.debug and self.log("replacing current input: {c} with last input: {p}".format(c=self.current_input, p=self.last_input))
-                    # throw away whatever we have built up for current_input
-                    # and replace with the last_input that was valid for conversion
-
-                    self.current_input = self.last_input
-                    # feedback for input not relevant anymore
-                    self.feedback_window.erase()
-                    result = hex_to_dec_str(self.current_input)
-                    self.feedback_window.addstr(result, curses.A_STANDOUT)
-                    self.feedback_window.refresh()
-
-                    # refresh input_window last so cursor returns to user input
-                    self.input_window.erase()
-                    self.input_window.addstr(self.current_input)
-                    self.input_window.refresh()
-                    continue
-
-                # if i == curses.KEY_LEFT:
-                # input_window.move
-                # handle delete + replace on current char
-                # if at the beginning of input...
-
-                # if i == curses.KEY_RIGHT:
-                # input_window.move
-                # handle delete + replace on current char
-                # if at the end of input...
-
-                # handle backspace
-                if i in (curses.KEY_BACKSPACE, KEY_BACKSPACE, KEY_DELETE):
-                    self.debug and self.log("handling backspace")
-                    if len(self.current_input) == 0:
-                        self.debug and self.log("no text left to delete")
-                        continue
-
-                    self.current_input = self.current_input[:-1]
-                    self.input_window_replace(self.current_input)
-
-                    # if we previously had an error, the result window will have a background used for errors
-                    self.feedback_window.erase()
-                    # if we send an empty string to addstr, we'll get back an error
-                    result = ""
-                    if len(self.current_input) > 0:
-                        result = hex_to_dec_str(self.current_input)
-                        self.feedback_window.addstr(result, curses.A_STANDOUT)
-
-                    self.debug and self.log("wrote result after backspace: " + result)
-
-                    self.feedback_window.refresh()
-                    self.input_window.refresh()
-                    continue
-
-                # KEY_ENTER is some numeric keyboards
-                # macOS sends a \lf with the <return> key
-                # treat these as their numeric inputs (no ord)
-                if i == curses.KEY_ENTER or i == KEY_ENTER:
-                    self.debug and self.log("read enter key")
-                    if len(self.error) > 0:
-                        self.error = ""
-                        # clear window contents and refresh to update it
-                        self.debug and self.log("updating clearing error from result window")
-                        # if we previously had an error, the result window will have a background used for errors
-                        self.feedback_window.bkgd(' ')
-                        # reset expected debug decoration if necessary
-                        self.debug and self.feedback_window.bkgd(' ', curses.color_pair(self.bg_red))
-                        self.feedback_window.erase()
-                        # do not clear any other windows, this is dismissing the error only
-                        self.feedback_window.refresh()
-                        # refresh input_window to set cursor
-                        self.input_window.refresh()
-                        continue
-
-                    # just ignore errant or idle return presses
-                    self.current_input = self.current_input.strip()
-                    if self.current_input == "":
-                        continue
-
-                    result = hex_to_dec_str(self.current_input)
-                    result_history_output = "{} => {}".format(self.current_input, result)
-
-                    # erase existing output and replace with contents of self.history,
-                    # which is sorted most recent to least recent
-                    self.history.appendleft(result_history_output)
-
-                    self.history_window.erase()
-                    self.feedback_window.erase()
-                    self.input_window.erase()
-
-                    self.debug and self.log("writing history")
-
-                    # break when we hit our window limit vs adding off-screen
-                    # this does not prevent a crash on subwindow buffers
-                    i = 0
-                    history_max_y, _ = self.history_window.getmaxyx()
-                    for res in self.history:
-                        i += 1
-                        self.history_window.addstr(res + "\n")
-                        if i >= history_max_y:
-                            break
-
-                    # UAF exists here?
-                    # addressable_history = "\n".join(self.history)
-                    # self.history_window.addstr(addressable_history)
-
-                    # with output provided, now store last result for recall
-                    self.last_input = self.current_input
-                    self.current_input = ""
-
-                    self.feedback_window.refresh()
-                    self.history_window.refresh()
-                    # refresh input_window last so cursor returns to user input
-                    self.input_window.refresh()
-                    continue
-
-                # else, we have user input pending conversion
-                # convert ordinal to Unicode code point
-                i_chr = chr(i)
-
-                # we check each char for being valid hex
-                if not is_hex(i_chr):
-                    # self.error stored for checking what we sent to the screen on the next loop through
-                    self.error = "input not valid hexadecimal character. ord: {o} chr: {c}".format(o=i, c=i_chr)
-                    self.feedback_window.erase()
-                    self.feedback_window.addstr(self.error, curses.A_STANDOUT)
-                    self.feedback_window.refresh()
-                    continue
-
-                if len(self.error) > 0:
-                    # clear out error tracking, but hold off on refresh or writing
-                    # as we're going to refresh this window later anyway when we write
-                    # the updated result for current input
-                    self.error = ""
-
-                self.current_input += i_chr
-                self.input_window.addstr(i_chr)
-
-                self.debug and self.log("updating feedback")
-                result = hex_to_dec_str(self.current_input)
-                self.feedback_window.erase()
-                self.feedback_window.addstr(result, curses.A_STANDOUT)
-                self.feedback_window.refresh()
-
-
             # catch ^c and EOF, clean exit
             except (KeyboardInterrupt, EOFError):
                 curses.endwin()
                 print("exception caught")
                 return
 
+    # ^C exits.  let ^D quit, let "q" quit
+    def _on_quit(self, i):
+        curses.endwin()
+        return True
+
+    # a resize rebuilds every subwindow at the new size and redraws them from state, once per burst of resize events
+    def _on_resize(self, i):
+        # terminals send a stream of resize events while being dragged. only the last size matters,
+        # so drain any queued behind this one and hand back the first key that isn't a resize
+        self.input_window.nodelay(True)
+        try:
+            pending = self.input_window.getch()
+            while pending in _RESIZE_KEYS:
+                pending = self.input_window.getch()
+            if pending != -1:
+                curses.ungetch(pending)
+        finally:
+            self.input_window.nodelay(False)
+
+        curses.update_lines_cols()
+        new_y, new_x = self.main_window.getmaxyx()
+        self._main_max_y = new_y
+        curses.resize_term(new_y, new_x)
+        self.log("windows refreshed after resize")
+        self.debug and self.report_positions()
+
+        # windows are re-created instead of resized:
+        # Python(97765,0x2094ddf00) malloc: Incorrect checksum for freed object 0x11b03ca00: probably modified after being freed.
+        # Corrupt value: 0x3200000000
+        # Python(97765,0x2094ddf00) malloc: *** set a breakpoint in malloc_error_break to debug
+        #
+        # when inputting and re-sizing while inputting text. if you input text, then scroll beyond, then within buffer, you can force this.
+        # this happens even with a clear() instead of an erase
+        self.log("resize => erasing history window")
+        self.history_window.erase()
+        del self.input_window, self.feedback_window, self.history_window
+        self.input_window_new()
+        self.feedback_window_new()
+        self.history_window_new()
+
+        self.log("resize => re-writing input and feedback")
+        self.input_window.addstr(self.current_input)
+        self.feedback_window.erase()
+        # clipped short of the last column, a wrap would scroll the one-line window and leave only the tail showing
+        self._last_feedback = self.error or (str(self._value) if self.current_input else "")
+        self._last_feedback and self.feedback_window.addnstr(self._last_feedback, self._feedback_max_x - 1, curses.A_STANDOUT)
+
+        self.log("resize => re-writing history")
+        # self.history is the only model of what's on screen; it is never joined into one string.
+        # history_window_new capped it to the rows that fit, pushed oldest first so the most recent entry ends up at the top
+        for res in reversed(self.history):
+            self.history_window_push(res)
+
+        # the prompt lives on main_window, stage it before the subwindows drawn over it
+        self.main_window.noutrefresh()
+        self._history_dirty = self._feedback_dirty = self._input_dirty = True
+
+        self.log("resize => resize complete")
+        self.debug and self.report_positions()
+
+    # if input is up allow, set user input to the last input
+    # very likely the user will then backspace, edit, hit enter
+    def _on_up(self, i):
+        # if no previous input, just continue after clearing any errors
+        if not self.last_input:
+            self.feedback_window_replace("")
+            return
+
+        self.log("replacing current input: {c} with last input: {p}", c=self.current_input, p=self.last_input)
+        # throw away whatever we have built up for current_input
+        # and replace with the last_input that was valid for conversion
+
+        self.current_input = self.last_input
+        self._value = self.last_value
+        # feedback for input not relevant anymore
+        self.feedback_window_replace(str(self._value))
+
+        self.input_window.erase()
+        self.input_window.addstr(self.current_input)
+        self._input_dirty = True
+
+    # handle backspace
+    def _on_backspace(self, i):
+        self.log("handling backspace")
+        if len(self.current_input) == 0:
+            self.log("no text left to delete")
+            return
+
+        self.current_input = self.current_input[:-1]
+        self._value >>= 4
+        self.input_window_replace(self.current_input)
+
+        result = ""
+        if len(self.current_input) > 0:
+            result = str(self._value)
+        self.feedback_window_replace(result)
+
+        self.log("wrote result after backspace: {}", result)
+        self._input_dirty = True
+
+    # KEY_ENTER is some numeric keyboards
+    # macOS sends a \lf with the <return> key
+    # treat these as their numeric inputs (no ord)
+    def _on_enter(self, i):
+        self.log("read enter key")
+        if len(self.error) > 0:
+            self.error = ""
+            # clear window contents, queued for the single flush in _commit
+            self.log("updating clearing error from result window")
+            # errors are drawn with A_STANDOUT text, not a window background, so the background
+            # (and its debug decoration) is untouched and erasing the text is enough.
+            # do not clear any other windows, this is dismissing the error only
+            self.feedback_window_replace("")
+            return
+
+        # just ignore errant or idle return presses
+        self.current_input = self.current_input.strip()
+        if self.current_input == "":
+            return
+
+        result = str(self._value)
+        result_history_output = f"{self.current_input} => {result}"
+
+        # self.history is sorted most recent to least recent
+        self.history.appendleft(result_history_output)
+
+        # an already empty feedback window is left alone
+        self.feedback_window_replace("")
+        self.input_window.erase()
+
+        self.log("writing history")
+
+        # only the new entry is drawn, older entries are already on screen
+        self.history_window_push(result_history_output)
+
+        # with output provided, now store last result for recall
+        self.last_input = self.current_input
+        self.last_value = self._value
+        self.current_input = ""
+        self._value = 0
+        self._input_dirty = True
+
+    # any key without a handler isn't valid hex
+    def _on_invalid_input(self, i):
+        # self.error stored for checking what we sent to the screen on the next loop through
+        self.error = _ERR_TMPL % (i, chr(i) if 32 <= i < 127 else "<nonprintable>")
+        self.feedback_window_replace(self.error)
+
+    # else, we have user input pending conversion. the dispatch table only sends hex digits here
+    def _on_input(self, i):
+        if len(self.error) > 0:
+            # clear out error tracking, but hold off on refresh or writing
+            # as we're going to refresh this window later anyway when we write
+            # the updated result for current input
+            self.error = ""
+
+        # convert ordinal to Unicode code point
+        chars = [chr(i)]
+        value = (self._value << 4) | _HEX_VAL[i]
+
+        # a paste shows up as a burst of pending keys. drain any hex already waiting so the burst costs one
+        # conversion and one paint instead of one per char, and hand back the first key that isn't hex
+        self.input_window.nodelay(True)
+        try:
+            pending = self.input_window.getch()
+            while _is_hex_ord(pending):
+                chars.append(chr(pending))
+                value = (value << 4) | _HEX_VAL[pending]
+                pending = self.input_window.getch()
+            if pending != -1:
+                curses.ungetch(pending)
+        finally:
+            self.input_window.nodelay(False)
+
+        typed = "".join(chars)
+        self.current_input += typed
+        self._value = value
+        self.input_window.addstr(typed)
+
+        self.log("updating feedback")
+        # leading zeros don't change the result, feedback_window_replace leaves the window alone then
+        self.feedback_window_replace(str(self._value))
+        self._input_dirty = True
+
+    # --notcurses front end: the same prompt, feedback and history rows drawn with plain ANSI escapes on a cbreak tty.
+    # each keystroke's screen update is built in one bytearray and sent with a single write
+    def main_notcurses(self, fd_in, fd_out):
+        prompt = self.prompt.encode()
+        self._ansi_input_col = len(prompt) + 1 # ANSI positions are 1 indexed
+        self._ansi_fd_out = fd_out # re-measured on enter, in case the terminal was resized
+        self._ansi_cols = os.get_terminal_size(fd_out).columns
+        # alternate screen, cleared, prompt at the top left. the same screen curses would give us
+        os.write(fd_out, b"\x1b[?1049h\x1b[H\x1b[2J" + prompt)
+        self.log("### notcurses initialized ###")
+
+        # a byte read past a lone escape, handled as the next keystroke
+        pending = b""
+        while True:
+            byte = pending or os.read(fd_in, 1)
+            pending = b""
+            if not byte:
+                return
+            i = byte[0]
+            self.log("read byte: {}", i)
+            out = bytearray()
+
+            if i == EOF_CHORD or i == KEY_Q:
+                return
+
+            if i == 27:
+                # arrow keys arrive as ESC [ A or ESC O A. other sequences are dropped,
+                # a lone escape is reported like any other invalid key
+                sequence = self._read_escape(fd_in)
+                if sequence in (b"[A", b"OA"):
+                    self._ansi_on_up(out)
+                elif sequence[:1] not in (b"[", b"O"):
+                    self._ansi_on_input(out, i)
+                    pending = sequence
+            elif i == KEY_BACKSPACE or i == 8:
+                self._ansi_on_backspace(out)
+            elif i == KEY_ENTER or i == 13:
+                self._ansi_on_enter(out)
+            else:
+                self._ansi_on_input(out, i)
+
+            out and os.write(fd_out, out)
+
+    # the rest of an escape sequence after ESC. empty if nothing followed it, a single byte if what followed isn't a CSI/SS3
+    @staticmethod
+    def _read_escape(fd_in):
+        if not select.select([fd_in], [], [], 0.05)[0]:
+            return b""
+        sequence = os.read(fd_in, 1)
+        if sequence in (b"[", b"O"):
+            # parameters and intermediates until the final byte in @ through ~
+            while True:
+                byte = os.read(fd_in, 1)
+                sequence += byte
+                if not byte or 0x40 <= byte[0] <= 0x7e:
+                    break
+        return sequence
+
+    # redraw the feedback row and put the cursor back where it was
+    def _ansi_feedback(self, out, text):
+        if text == self._last_feedback:
+            return
+        self._last_feedback = text
+        out += b"\x1b7\x1b[2;1H\x1b[2K"
+        if text:
+            out += b"\x1b[7m" + text[:self._ansi_cols - 1].encode() + b"\x1b[m"
+        out += b"\x1b8"
+
+    # columns left for the input after the prompt, one spare so the cursor never sits past the last column
+    def _ansi_input_room(self):
+        return max(self._ansi_cols - self._ansi_input_col, 1)
+
+    # redraw the input after the prompt, leaving the cursor at its end.
+    # input wider than the row shows only its tail
+    def _ansi_input(self, out):
+        out += b"\x1b[1;%dH\x1b[K" % self._ansi_input_col + self.current_input[-self._ansi_input_room():].encode()
+
+    def _ansi_on_up(self, out):
+        self.error = ""
+        if not self.last_input:
+            self._ansi_feedback(out, "")
+            return
+        self.current_input = self.last_input
+        self._value = self.last_value
+        self._ansi_feedback(out, str(self._value))
+        self._ansi_input(out)
+
+    def _ansi_on_backspace(self, out):
+        if len(self.current_input) == 0:
+            return
+        self.current_input = self.current_input[:-1]
+        self._value >>= 4
+        # a clipped input brings back a hidden digit on the left, so the row is redrawn rather than erased from the cursor
+        self._ansi_input(out)
+        self._ansi_feedback(out, str(self._value) if self.current_input else "")
+
+    def _ansi_on_enter(self, out):
+        if len(self.error) > 0:
+            # dismiss the error only
+            self.error = ""
+            self._ansi_feedback(out, "")
+            return
+        if self.current_input == "":
+            return
+
+        result_history_output = f"{self.current_input} => {self._value}"
+        self.history.appendleft(result_history_output)
+        self._ansi_cols = os.get_terminal_size(self._ansi_fd_out).columns
+        # insert a line at the top of the history rows, the terminal pushes older entries down and off the bottom
+        out += b"\x1b[3;1H\x1b[L" + result_history_output[:self._ansi_cols - 1].encode()
+        self._ansi_feedback(out, "")
+
+        self.last_input = self.current_input
+        self.last_value = self._value
+        self.current_input = ""
+        self._value = 0
+        self._ansi_input(out)
+
+    def _ansi_on_input(self, out, i):
+        if not _is_hex_ord(i):
+            self.error = _ERR_TMPL % (i, chr(i) if 32 <= i < 127 else "<nonprintable>")
+            self._ansi_feedback(out, self.error)
+            return
+        self.error = ""
+        i_chr = chr(i)
+        self.current_input += i_chr
+        self._value = (self._value << 4) | _HEX_VAL[i]
+        # terminal echo is off in cbreak mode, so the digit is written here at the cursor.
+        # once the input is wider than the row, the clipped tail is redrawn instead
+        if len(self.current_input) <= self._ansi_input_room():
+            out += i_chr.encode()
+        else:
+            self._ansi_input(out)
+        self._ansi_feedback(out, str(self._value))
+
+
+# --notcurses setup: cbreak on the controlling tty for the life of the session, restored however it ends
+def _run_notcurses(htoi):
+    fd_in, fd_out = sys.stdin.fileno(), sys.stdout.fileno()
+    saved_attributes = termios.tcgetattr(fd_in)
+    tty.setcbreak(fd_in)
+    try:
+        htoi.main_notcurses(fd_in, fd_out)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.write(fd_out, b"\x1b[?1049l")
+        termios.tcsetattr(fd_in, termios.TCSADRAIN, saved_attributes)
+
+
+# curses setup for interactive mode, kept apart from the argument-only path that never touches curses
+def _run_interactive(htoi):
+    # curses is imported to support up arrow input
+    stdscr = curses.initscr()
+    curses.start_color()
+    stdscr.keypad(True) # detect special chars like key-up, otherwise key-up looks like 'A'
+    # wrapper handles noecho, cbreak, keypad
+    curses.wrapper(htoi.main)
+
+
+# inputs at least this long are parsed with bytes.fromhex, whose C loop over byte pairs beats int(s, 16) on long
+# strings. shorter ones go to int(), the extra bytes object costs more than it saves
+FROMHEX_MIN_LEN = 512
+
+# int(s, 16) for the CLI.  fromhex also skips spaces between byte pairs, which int() rejects, so only plain
+# ascii letters/digits are given to it, and anything it refuses (non hex letters) falls through to int()'s error
+def _hex_to_int(s):
+    if len(s) >= FROMHEX_MIN_LEN and s.isascii() and s.isalnum():
+        try:
+            return int.from_bytes(bytes.fromhex(s if len(s) % 2 == 0 else "0" + s), "big")
+        except ValueError:
+            pass
+    return int(s, 16)
+
+
+# non-interactive conversion of a single argument, returns the exit code.
+# int() is called directly instead of hex_to_dec so bad input can't pass as a -1 result.
+# the result goes to the stdout fd with os.write, skipping print and the text layer since it is always ascii
+def _cli_convert(data):
+    try:
+        value = _hex_to_int(data)
+    except ValueError:
+        os.write(2, b"invalid hex\n")
+        return 2
+    # lift the decimal digit limit (3.11+), a long hex string is a legitimate input here
+    hasattr(sys, "set_int_max_str_digits") and sys.set_int_max_str_digits(0)
+    mpz_digits = _load_gmpy2_digits() if len(data) > GMPY2_MIN_LEN else None
+    if mpz_digits is not None:
+        os.write(1, mpz_digits(value).encode("ascii") + b"\n")
+    else:
+        os.write(1, b"%d\n" % value)
+    return 0
+
 
 if __name__ == "__main__":
+    import os
+    import sys
+
+    # a lone positional argument (`htoi.py beef`) is converted before argparse is even imported,
+    # for a one-shot conversion startup is most of the run time
+    if len(sys.argv) == 2 and sys.argv[1][:1] not in ("", "-"):
+        sys.exit(_cli_convert(sys.argv[1]))
+
     # minimal imports until we know the runtime mode
     import argparse
 
     parser = argparse.ArgumentParser("htoi")
     parser.add_argument("--debug", help="enable debug logging and visual indicators in interactive mode", action='store_true')
+    parser.add_argument("--notcurses", help="run interactive mode on a raw tty with ANSI escapes instead of curses", action='store_true')
     parser.add_argument("stdin_data", help="position argument to convert, skipping interactive mode", action="store", type=str, nargs="?")
     args = parser.parse_args()
 
@@ -426,31 +832,47 @@ if __name__ == "__main__":
     # if we received positional args
     # arguments are already treated as strings for input
     if args.stdin_data and len(args.stdin_data) > 0:
-        print(hex_to_dec(args.stdin_data))
+        sys.exit(_cli_convert(args.stdin_data))
     else:
+        # Htoi builds its history on construction, so deque is needed before the rest of the interactive imports
+        from collections import deque # used for results instead of linear time lists
         htoi = Htoi(debug=args.debug)
 
+        if args.notcurses:
+            import select
+            import termios
+            import tty
+
+            try:
+                _run_notcurses(htoi)
+            except termios.error as e:
+                # stdin isn't a tty, reported the same way as a curses initialization failure
+                if htoi.debug:
+                    import traceback
+                    htoi.log(traceback.format_exc())
+                    raise e
+
+                exception_summary = f"Could not initialize window: {e}"
+                print(exception_summary)
+                sys.exit(1)
+            sys.exit(0)
+
         try:
             # input grouping is kept separate for sake of run speed for non-interactive mode
-            # collections's deque is imported inside the class. the import gets lost for this module.
             import curses
-            from datetime import datetime, timezone
-            from typing import Optional
-            from math import log10 # only required in interactive mode for line count
-            from sys import exit, stderr # for setting exit code when interactive mode throws an uncaught exception
-
-            # curses is imported to support up arrow input
-            stdscr = curses.initscr()
-            curses.start_color()
-            stdscr.keypad(True) # detect special chars like key-up, otherwise key-up looks like 'A'
-            # wrapper handles noecho, cbreak, keypad
-            curses.wrapper(htoi.main)
+            from itertools import islice
+            # key groupings that need curses' own constants, built once for hashed lookup per keystroke
+            _BACKSPACE_KEYS = frozenset((curses.KEY_BACKSPACE, KEY_BACKSPACE, KEY_DELETE))
+            _ENTER_KEYS = frozenset((curses.KEY_ENTER, KEY_ENTER))
+            _RESIZE_KEYS = frozenset((RESIZE_ORD, curses.KEY_RESIZE))
+
+            _run_interactive(htoi)
         except curses.error as e:
             if htoi.debug:
                 import traceback
                 htoi.log(traceback.format_exc())
                 raise e
 
-            exception_summary = "Could not initialize window: {e_str}".format(e_str=e)
+            exception_summary = f"Could not initialize window: {e}"
             print(exception_summary)
-            exit(1)
+            sys.exit(1)